@@ -8,7 +8,7 @@ from src.services.api_service import DriversAPIClient
 from src.lngraph.tools.driver_tools import DriverTools
 from src.lngraph.graph import create_agent_graph
 import logging
-from src.models.agent_state_model import AgentState
+from src.models.agent_state_model import AgentState, append_message
 
 # --- Basic Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -108,7 +108,7 @@ async def main():
                 print("🚗 Agent: Please tell me what you'd like to do.")
                 continue
 
-            conversation_state["messages"].append(HumanMessage(content=user_input))
+            append_message(conversation_state, HumanMessage(content=user_input))
             conversation_state["last_user_message"] = user_input
             conversation_state["last_error"] = None
 
@@ -163,6 +163,14 @@ async def main():
 
 if __name__ == "__main__":
     try:
+        # uvloop's libuv-backed loop is a drop-in replacement that speeds up
+        # the many small awaits against Redis and httpx; fall back to the
+        # stdlib loop where it isn't available (e.g. Windows).
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
         asyncio.run(main())
     except KeyboardInterrupt:
         print("\nExiting...")
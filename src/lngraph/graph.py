@@ -1,3 +1,4 @@
+import logging
 from langgraph.graph import StateGraph, END
 from src.services.api_service import DriversAPIClient
 from src.models.agent_state_model import AgentState
@@ -13,6 +14,8 @@ from src.lngraph.nodes.more_drivers_node import MoreDriversNode
 from langchain_google_vertexai import ChatVertexAI
 from src.lngraph.tools.driver_tools import DriverTools
 
+logger = logging.getLogger(__name__)
+
 def route_after_intent_classification(state: AgentState):
     """
     FIXED: Enhanced router with better validation and trip info prioritization.
@@ -24,7 +27,8 @@ def route_after_intent_classification(state: AgentState):
 
     current_drivers_length = len(current_drivers) if current_drivers else 0
 
-    print(f"DEBUG: Routing intent '{intent}' with search_city: {search_city}, drivers: {current_drivers_length}")
+    logger.debug("Routing intent '%s' with search_city: %s, drivers: %s",
+                 intent, search_city, current_drivers_length)
 
     # FIXED: Better trip info validation
     has_complete_trip_info = state.get("full_trip_details", False)
@@ -74,10 +78,10 @@ def route_after_trip_collection(state: AgentState):
     has_complete_trip_info = state.get("full_trip_details", False)
 
     if has_complete_trip_info:
-        print("DEBUG: Trip info complete, proceeding to search drivers")
+        logger.debug("Trip info complete, proceeding to search drivers")
         return "search_drivers"
     else:
-        print("DEBUG: Trip info incomplete, generating response to ask for missing info")
+        logger.debug("Trip info incomplete, generating response to ask for missing info")
         return "generate_response"
 
 def should_continue_conversation(state: AgentState):
@@ -92,7 +96,7 @@ def create_agent_graph(llm: ChatVertexAI, driver_tools: DriverTools, api_client:
     """
     initialize_agent_node = InitializeAgentNode()
     classify_intent_node = ClassifyIntentNode(llm)
-    trip_info_collection_node = TripInfoCollectionNode(llm)
+    trip_info_collection_node = TripInfoCollectionNode(llm, api_client.redis_service)
     search_drivers_node = SearchDriversNode(llm, driver_tools)
     get_driver_info_node = GetDriverInfoNode(llm, driver_tools)
     filter_drivers_node = FilterDriversNode(llm, driver_tools)
@@ -1,6 +1,8 @@
 from typing import Dict, Any, Literal
-from src.models.agent_state_model import AgentState
+from src.models.agent_state_model import AgentState, formatted_line
 import logging
+import re
+from cachetools import TTLCache
 from langchain_google_vertexai import ChatVertexAI
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
@@ -33,6 +35,21 @@ class Intent(BaseModel):
         "more_drivers_intent",
         """)
 
+# Deterministic phrasings that don't need an LLM: each pattern must cover the
+# whole message, so anything with extra context ("show me more SUVs") still
+# falls through to the classifier. Compiled once at import.
+_FAST_PATHS: list = [
+    (
+        re.compile(r"^(?:show\s+(?:me\s+)?more|more(?:\s+drivers?|\s+options?)?|next(?:\s+page)?|any\s+other\s+options?)[.!?]*$"),
+        "more_drivers_intent",
+    ),
+    (
+        re.compile(r"^(?:hi|hello|hey|good\s+(?:morning|afternoon|evening)|thanks?|thank\s+you|ok(?:ay)?|bye|goodbye)[.!?]*$"),
+        "general_intent",
+    ),
+]
+
+
 class ClassifyIntentNode:
     """
     Node to classify the user's intent based on the conversation history.
@@ -47,18 +64,8 @@ class ClassifyIntentNode:
         """
         self.llm = llm.with_structured_output(Intent)
 
-    async def execute(self, state: AgentState) -> Dict[str, Any]:
-        """
-        Executes the intent classification logic.
-
-        Args:
-            state: The current state of the agent.
-
-        Returns:
-            A dictionary containing the classified intent and any potential errors.
-        """
-        logger.info("Executing ClassifyIntentNode...")
-
+        # The prompt is static; build the template and chain once instead of
+        # re-parsing the message templates on every graph step.
         prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an expert at classifying user intent for a cab booking agent.
             Analyze the user's message in the context of the conversation and classify it into one of the following intents:
@@ -72,14 +79,50 @@ class ClassifyIntentNode:
             Based on the last user message, determine the most appropriate intent."""),
             ("human", "Conversation History:\n{history}\n\nUser Message: {user_message}")
         ])
+        self.chain = prompt | self.llm
+
+        # Users repeat the same phrasings ("show me more", "book him") across
+        # turns; a short-lived memo answers those repeats without an LLM
+        # round-trip, which dominates this node's latency. Keyed on the
+        # normalized message plus the most recent history line, because the
+        # intent of short replies ("yes", a bare city name) flips with what
+        # the assistant just asked.
+        self._intent_cache: TTLCache = TTLCache(maxsize=512, ttl=300)
+
+    async def execute(self, state: AgentState) -> Dict[str, Any]:
+        """
+        Executes the intent classification logic.
+
+        Args:
+            state: The current state of the agent.
+
+        Returns:
+            A dictionary containing the classified intent and any potential errors.
+        """
+        logger.info("Executing ClassifyIntentNode...")
 
-        history = "\n".join([f"{msg.type}: {msg.content}" for msg in state["messages"][:-1]])
+        history = "\n".join([formatted_line(msg) for msg in state["messages"][:-1]])
         user_message = state["messages"][-1].content
 
-        chain = prompt | self.llm
+        normalized_message = user_message.strip().lower()
+
+        # Unambiguous messages are pure string matching, not an LLM problem.
+        for pattern, fast_intent in _FAST_PATHS:
+            if pattern.match(normalized_message):
+                logger.info("Fast-path intent match: %s -> %s", normalized_message, fast_intent)
+                return {"intent": fast_intent}
+
+        # The preceding turn disambiguates context-dependent replies, so it
+        # is part of the memo key; only the _FAST_PATHS tier above may match
+        # on the message alone.
+        cache_key = (normalized_message, history.rsplit("\n", 1)[-1])
+        cached_intent = self._intent_cache.get(cache_key)
+        if cached_intent is not None:
+            logger.info("Intent cache hit: %s -> %s", normalized_message, cached_intent)
+            return {"intent": cached_intent}
 
         try:
-            res = await chain.ainvoke({
+            res = await self.chain.ainvoke({
                 "history": history,
                 "user_message": user_message
             })
@@ -87,7 +130,8 @@ class ClassifyIntentNode:
             response = Intent.model_validate(res)
 
             logger.info(f"Classified intent as: {response.intent}")
-            print("state city:", state["search_city"])
+            logger.debug("state city: %s", state["search_city"])
+            self._intent_cache[cache_key] = response.intent
             return {"intent": response.intent}
         except Exception as e:
             logger.error(f"Error during intent classification: {e}", exc_info=True)
@@ -37,30 +37,45 @@ class GetDriverInfoNode:
         self.llm = llm
         self.driver_tools = driver_tools
 
+        # Static prompt: build the template and extraction chain once at node
+        # construction instead of per execute() call.
+        extract_prompt = ChatPromptTemplate.from_messages([
+            ("system", "You are an entity extraction expert. From the user's message, identify the driver they are asking about. They might use a name. Extract the name if mentioned."),
+            ("human", "Available driver names: {driver_names}\n\nUser Message: {user_message}")
+        ])
+        self.extract_chain = extract_prompt | self.llm.with_structured_output(DriverIdentifier)
+
     def _find_driver_by_name(self, drivers: List[DriverDetailsForState], search_name: str):
         """
         Find driver by name with fuzzy matching.
+
+        Single pass over the list: each driver's name is lowered once and
+        checked against all three tiers, keeping the best-ranked hit
+        (exact > partial > reverse partial) instead of rescanning the list
+        and re-lowering every name per tier.
         """
         search_name_lower = search_name.lower()
 
-        # First try exact match
+        partial_match = None
+        reverse_match = None
         for driver in drivers:
-            if driver["driver_name"].lower() == search_name_lower:
-                return driver
+            driver_name_lower = driver["driver_name"].lower()
 
-        # Try partial match (driver name contains search term)
-        for driver in drivers:
-            if search_name_lower in driver["driver_name"].lower():
+            # Exact match wins outright
+            if driver_name_lower == search_name_lower:
                 return driver
 
-        # Try reverse partial match (search term contains driver name parts)
-        for driver in drivers:
-            driver_name_parts = driver["driver_name"].lower().split()
-            for part in driver_name_parts:
-                if part in search_name_lower and len(part) > 2:
-                    return driver
+            # Partial match (driver name contains search term)
+            if partial_match is None and search_name_lower in driver_name_lower:
+                partial_match = driver
+            elif partial_match is None and reverse_match is None:
+                # Reverse partial match (search term contains driver name parts)
+                for part in driver_name_lower.split():
+                    if part in search_name_lower and len(part) > 2:
+                        reverse_match = driver
+                        break
 
-        return None
+        return partial_match or reverse_match
 
     async def execute(self, state: AgentState) -> Dict[str, Any]:
         """
@@ -94,16 +109,10 @@ class GetDriverInfoNode:
             }
 
         # 1. Extract which driver the user is asking about
-        extract_prompt = ChatPromptTemplate.from_messages([
-            ("system", "You are an entity extraction expert. From the user's message, identify the driver they are asking about. They might use a name. Extract the name if mentioned."),
-            ("human", "Available driver names: {driver_names}\n\nUser Message: {user_message}")
-        ])
-
         driver_names = [driver["driver_name"] for driver in available_drivers]
-        extract_chain = extract_prompt | self.llm.with_structured_output(DriverIdentifier)
 
         try:
-            raw = await extract_chain.ainvoke({
+            raw = await self.extract_chain.ainvoke({
                 "driver_names": ", ".join(driver_names),
                 "user_message": user_message
             })
@@ -46,28 +46,8 @@ class FilterDriversNode:
         self.llm = llm
         self.driver_tools = driver_tools
 
-    async def execute(self, state: AgentState) -> Dict[str, Any]:
-        """
-        FIXED: Executes the logic to extract filters and apply them via fresh API call.
-
-        Args:
-            state: The current state of the agent.
-
-        Returns:
-            A dictionary with the updated state values.
-        """
-        logger.info("Executing FilterDriversNode...")
-
-        user_message = state["last_user_message"]
-
-        if not state.get("search_city"):
-            logger.warning("Filter intent detected without an active search.")
-            return {
-                "last_error": "It looks like you want to filter, but we haven't searched for any drivers yet. Please tell me which city you're looking in first.",
-                "failed_node": "filter_drivers_node"
-            }
-
-        # 1. Extract filter criteria from the user's message
+        # Static prompt: build the template and extraction chain once at node
+        # construction instead of per execute() call.
         extract_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are an entity extraction expert. From the user's message, extract any specified filters for a cab driver search.
 
@@ -95,11 +75,32 @@ class FilterDriversNode:
             """),
             ("human", "User Message: {user_message}")
         ])
+        self.extract_chain = extract_prompt | self.llm.with_structured_output(FilterEntities)
 
-        extract_chain = extract_prompt | self.llm.with_structured_output(FilterEntities)
+    async def execute(self, state: AgentState) -> Dict[str, Any]:
+        """
+        FIXED: Executes the logic to extract filters and apply them via fresh API call.
+
+        Args:
+            state: The current state of the agent.
+
+        Returns:
+            A dictionary with the updated state values.
+        """
+        logger.info("Executing FilterDriversNode...")
 
+        user_message = state["last_user_message"]
+
+        if not state.get("search_city"):
+            logger.warning("Filter intent detected without an active search.")
+            return {
+                "last_error": "It looks like you want to filter, but we haven't searched for any drivers yet. Please tell me which city you're looking in first.",
+                "failed_node": "filter_drivers_node"
+            }
+
+        # 1. Extract filter criteria from the user's message
         try:
-            raw = await extract_chain.ainvoke({"user_message": user_message})
+            raw = await self.extract_chain.ainvoke({"user_message": user_message})
             extracted_filters = FilterEntities.model_validate(raw)
             # Use .model_dump() with exclude_unset=True to only get explicitly set fields
             filter_dict = extracted_filters.model_dump(exclude_unset=True)
@@ -172,10 +173,12 @@ class FilterDriversNode:
 
                 driver_details_for_state = [{"driver_name": driver.name, "driver_id": driver.id} for driver in filtered_drivers]
 
-                # A new filter action should replace the existing list of drivers
+                # A new filter action should replace the existing list of
+                # drivers. all_drivers gets its own copy so an in-place
+                # mutation of one view can't silently change the other.
                 return {
                     "current_drivers": driver_details_for_state,
-                    "all_drivers": driver_details_for_state,
+                    "all_drivers": list(driver_details_for_state),
                     "active_filters": updated_filters,
                     "is_filtered": True,
                     "total_filtered_results": tool_response.get("total", 0),
@@ -1,6 +1,7 @@
 from typing import Dict, Any
 from src.models.agent_state_model import AgentState
 import logging
+from cachetools import TTLCache
 from langchain_google_vertexai import ChatVertexAI
 from langchain_core.messages import AIMessage
 from src.services.api_service import DriversAPIClient
@@ -24,6 +25,15 @@ class ResponseGeneratorNode:
         self.llm = llm
         self.client = client
 
+        # Rendered listing rows keyed by (cache_key, driver_id). The same
+        # drivers are re-listed across turns (after filters, info requests,
+        # "show more"); a hit skips both the detail lookup and the string
+        # assembly for that row. Not hooked into DriversAPIClient.clear_cache,
+        # so an explicit cache clear can leave rows stale for up to the TTL —
+        # acceptable for display text, which only ever reflects a driver's
+        # name/vehicles/price as last fetched.
+        self._row_cache: TTLCache = TTLCache(maxsize=512, ttl=600)
+
     def _format_filter_summary(self, active_filters: Dict[str, Any]) -> str:
         """
         FIXED: Create human-readable filter summary.
@@ -190,25 +200,34 @@ class ResponseGeneratorNode:
 
             response_content = f"I found {len(current_drivers)} driver{'s' if len(current_drivers) != 1 else ''} in {search_city}{filter_text}:\n\n"
 
+            # The key depends only on the search, not the driver; compute it
+            # once instead of per rendered row.
+            cache_key = self.client._generate_cache_key(search_city, page) if search_city else None
+            logger.debug(f"cache_key: {cache_key}, and search_city: {search_city}, and page: {page}")
+
             for i, driver in enumerate(current_drivers, 1):
                 try:
-                    if not search_city:
+                    if not cache_key:
                         response_content += f"{i}. {driver['driver_name']} - Details unavailable\n"
                         continue
 
-                    cache_key = self.client._generate_cache_key(search_city, page)
-                    logger.debug(f"cache_key: {cache_key}, and search_city: {search_city}, and page: {page}")
-                    full_driver_detail = await self.client._get_driver_detail(cache_key, driver["driver_id"])
+                    # The row text is position-independent; only the leading
+                    # index changes between renders, so the rest is cacheable.
+                    row = self._row_cache.get((cache_key, driver["driver_id"]))
+                    if row is None:
+                        full_driver_detail = await self.client._get_driver_detail(cache_key, driver["driver_id"])
 
-                    logger.debug(f"full_driver_detail: {full_driver_detail}")
+                        logger.debug(f"full_driver_detail: {full_driver_detail}")
 
-                    vehicle_types = [v.vehicle_type for v in full_driver_detail.verified_vehicles]
-                    per_km_cost = [v.per_km_cost for v in full_driver_detail.verified_vehicles]
-                    vehicle_text = ", ".join(set(vehicle_types)) or "unknown"
-                    experience = full_driver_detail.experience if full_driver_detail.experience > 0 else full_driver_detail.experience + 1
+                        vehicle_types = [v.vehicle_type for v in full_driver_detail.verified_vehicles]
+                        per_km_cost = [v.per_km_cost for v in full_driver_detail.verified_vehicles]
+                        vehicle_text = ", ".join(set(vehicle_types)) or "unknown"
+                        experience = full_driver_detail.experience if full_driver_detail.experience > 0 else full_driver_detail.experience + 1
 
+                        row = f"{full_driver_detail.name} {experience} yrs exp, {vehicle_text}, ₹{per_km_cost}/km"
+                        self._row_cache[(cache_key, driver["driver_id"])] = row
 
-                    response_content += f"{i}. {full_driver_detail.name} {experience} yrs exp, {vehicle_text}, ₹{per_km_cost}/km\n"
+                    response_content += f"{i}. {row}\n"
 
                 except Exception as e:
                     logger.warning(f"Could not get details for driver {driver['driver_id']}: {e}")
@@ -37,6 +37,19 @@ class SearchDriversNode:
         self.llm = llm
         self.driver_tools = driver_tools
 
+        # Static prompt: build the template and extraction chain once at node
+        # construction instead of per execute() call.
+        extract_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an entity extraction expert. From the user's message, extract the city they want to search for a cab in.
+            Only extract if a city is explicitly mentioned. If no city is mentioned, return null for the city field.
+            Examples:
+            - "find me a cab in delhi" -> city: "delhi"
+            - "book me a cab" -> city: null
+            - "i need a ride from mumbai" -> city: "mumbai" """),
+            ("human", "{user_message}")
+        ])
+        self.extract_chain = extract_prompt | self.llm.with_structured_output(SearchEntities)
+
     async def execute(self, state: AgentState) -> Dict[str, Any]:
         """
         Executes the driver search logic.
@@ -55,18 +68,8 @@ class SearchDriversNode:
         # 1. Extract city if not already in state
         if not city:
             logger.debug("City not in state, attempting to extract from message.")
-            extract_prompt = ChatPromptTemplate.from_messages([
-                ("system", """You are an entity extraction expert. From the user's message, extract the city they want to search for a cab in.
-                Only extract if a city is explicitly mentioned. If no city is mentioned, return null for the city field.
-                Examples:
-                - "find me a cab in delhi" -> city: "delhi"
-                - "book me a cab" -> city: null
-                - "i need a ride from mumbai" -> city: "mumbai" """),
-                ("human", "{user_message}")
-            ])
-            extract_chain = extract_prompt | self.llm.with_structured_output(SearchEntities)
             try:
-                raw = await extract_chain.ainvoke({"user_message": user_message})
+                raw = await self.extract_chain.ainvoke({"user_message": user_message})
                 entities = SearchEntities.model_validate(raw)
                 city = entities.city
             except Exception as e:
@@ -96,12 +99,21 @@ class SearchDriversNode:
 
                 logger.info(f"Successfully found {driver_count} drivers.")
 
-                # CRITICAL: Reset state for a new search
+                # Build the slim state entries once; current and all drivers
+                # start out as the same view after a fresh search.
+                driver_details_for_state = [
+                    {"driver_name": driver.name, "driver_id": driver.id} for driver in drivers
+                ]
+
+                # CRITICAL: Reset state for a new search.
+                # all_drivers gets its own copy — sharing one list object
+                # under both keys means a later in-place mutation of one view
+                # silently changes the other.
                 return {
                     "search_city": city,
                     "current_page": current_page,
-                    "current_drivers": [{"driver_name": driver.name, "driver_id": driver.id} for driver in drivers],
-                    "all_drivers": [{"driver_name": driver.name, "driver_id": driver.id} for driver in drivers],
+                    "current_drivers": driver_details_for_state,
+                    "all_drivers": list(driver_details_for_state),
                     "total_results": tool_response.get("total", 0),
                     "has_more_results": tool_response.get("has_more", False),
                     "is_filtered": False,
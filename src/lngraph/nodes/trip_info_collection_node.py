@@ -1,9 +1,11 @@
 from typing import Dict, Any, Optional
-from src.models.agent_state_model import AgentState
+from src.models.agent_state_model import AgentState, formatted_line
+import hashlib
 import logging
 from langchain_google_vertexai import ChatVertexAI
 from langchain_core.prompts import ChatPromptTemplate
 from pydantic import BaseModel, Field
+from src.services.cache_service import RedisService
 
 logger = logging.getLogger(__name__)
 
@@ -35,14 +37,54 @@ class TripInfoCollectionNode:
     FIXED: Better conversation history analysis and persistent state management.
     """
 
-    def __init__(self, llm: ChatVertexAI):
+    def __init__(self, llm: ChatVertexAI, redis_service: Optional[RedisService] = None,
+                 extraction_cache_ttl_seconds: int = 86400):
         """
         Initializes the TripInfoCollectionNode.
 
         Args:
             llm: An instance of a language model for entity extraction.
+            redis_service: Optional Redis service used to persist extraction results
+                across process restarts, so redeploys don't cold-start the cache.
+            extraction_cache_ttl_seconds: How long cached extractions stay valid.
         """
         self.llm = llm
+        self.redis_service = redis_service
+        self.extraction_cache_ttl_seconds = extraction_cache_ttl_seconds
+
+        # Static prompt: build the template and extraction chain once at node
+        # construction instead of per execute() call.
+        extract_prompt = ChatPromptTemplate.from_messages([
+            ("system", """You are an expert at extracting trip information from conversations.
+            Analyze the ENTIRE conversation history to extract trip details that may have been mentioned across multiple messages.
+
+            Extract the following information:
+            - pickup_location: Where the trip starts (source city) - look for phrases like "from delhi", "pickup from", "starting from"
+            - drop_location: Where the trip ends (destination city) - look for phrases like "to mumbai", "going to", "destination"
+            - trip_type: "one-way", "round-trip", or "multi-city" - look for keywords like "round trip", "return journey", "back and forth", if not available set None
+            - trip_duration: Number of days for round-trip or multi-city trips - look for "3 days", "for 2 days", "week long"
+
+            IMPORTANT:
+            1. Look through the entire conversation, not just the current message
+            2. If a location is mentioned alone without context, consider it as pickup_location first
+            3. Only extract information that is explicitly mentioned
+
+            Examples:
+            - "book me a cab from delhi to mumbai" -> pickup: "delhi", drop: "mumbai"
+            - "I need drivers from delhi" then "jaipur" -> pickup: "delhi", drop: "jaipur"
+            - "delhi to mumbai round trip for 3 days" -> pickup: "delhi", drop: "mumbai", type: "round-trip", duration: 3
+            - Just "delhi" -> pickup: "delhi"
+            """),
+            ("human", "{conversation_context}")
+        ])
+        self.extract_chain = extract_prompt | self.llm.with_structured_output(TripInfo)
+
+    def _extraction_cache_key(self, conversation_context: str) -> str:
+        """
+        Build a deterministic cache key for an extraction over this exact context.
+        """
+        context_hash = hashlib.sha256(conversation_context.encode()).hexdigest()
+        return f"trip_extract_{context_hash}"
 
     def _analyze_conversation_history(self, messages, current_message: str) -> str:
         """
@@ -52,7 +94,7 @@ class TripInfoCollectionNode:
         recent_messages = messages[-10:] if len(messages) > 10 else messages
 
         conversation_context = "\n".join([
-            f"{msg.type}: {msg.content}" for msg in recent_messages
+            formatted_line(msg) for msg in recent_messages
         ])
 
         return f"Conversation History:\n{conversation_context}\n\nCurrent Message: {current_message}"
@@ -83,36 +125,25 @@ class TripInfoCollectionNode:
         # FIXED: Analyze entire conversation history, not just current message
         conversation_context = self._analyze_conversation_history(messages, user_message)
 
-        # Enhanced extraction prompt that considers conversation history
-        extract_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at extracting trip information from conversations.
-            Analyze the ENTIRE conversation history to extract trip details that may have been mentioned across multiple messages.
-
-            Extract the following information:
-            - pickup_location: Where the trip starts (source city) - look for phrases like "from delhi", "pickup from", "starting from"
-            - drop_location: Where the trip ends (destination city) - look for phrases like "to mumbai", "going to", "destination"
-            - trip_type: "one-way", "round-trip", or "multi-city" - look for keywords like "round trip", "return journey", "back and forth", if not available set None
-            - trip_duration: Number of days for round-trip or multi-city trips - look for "3 days", "for 2 days", "week long"
-
-            IMPORTANT:
-            1. Look through the entire conversation, not just the current message
-            2. If a location is mentioned alone without context, consider it as pickup_location first
-            3. Only extract information that is explicitly mentioned
-
-            Examples:
-            - "book me a cab from delhi to mumbai" -> pickup: "delhi", drop: "mumbai"
-            - "I need drivers from delhi" then "jaipur" -> pickup: "delhi", drop: "jaipur"
-            - "delhi to mumbai round trip for 3 days" -> pickup: "delhi", drop: "mumbai", type: "round-trip", duration: 3
-            - Just "delhi" -> pickup: "delhi"
-            """),
-            ("human", "{conversation_context}")
-        ])
-
-        extract_chain = extract_prompt | self.llm.with_structured_output(TripInfo)
-
         try:
-            raw = await extract_chain.ainvoke({"conversation_context": conversation_context})
-            trip_info = TripInfo.model_validate(raw)
+            # Check the persistent extraction cache before spending an LLM call.
+            trip_info = None
+            cache_key = None
+            if self.redis_service:
+                cache_key = self._extraction_cache_key(conversation_context)
+                cached_extraction = await self.redis_service.get(cache_key)
+                if cached_extraction is not None:
+                    logger.info(f"Extraction cache hit for key: {cache_key}")
+                    trip_info = TripInfo.model_validate(cached_extraction)
+
+            if trip_info is None:
+                raw = await self.extract_chain.ainvoke({"conversation_context": conversation_context})
+                trip_info = TripInfo.model_validate(raw)
+                if cache_key:
+                    await self.redis_service.set(
+                        cache_key, trip_info.model_dump(),
+                        expiration_seconds=self.extraction_cache_ttl_seconds
+                    )
 
             logger.info(f"Extracted from conversation - Pickup: {trip_info.pickup_location}, Drop: {trip_info.drop_location}, Type: {trip_info.trip_type}, Duration: {trip_info.trip_duration}")
 
@@ -148,13 +179,9 @@ class TripInfoCollectionNode:
         if updated_trip_type in ["round-trip", "multi-city"] and not updated_duration:
             missing_info.append("trip duration (how many days)")
 
-        # Determine if we have complete trip information
-        has_complete_info = (
-            updated_pickup and
-            updated_drop and
-            updated_trip_type and
-            (updated_trip_type or updated_duration)
-        )
+        # Determine if we have complete trip information. missing_info already
+        # encodes every requirement (including duration for round/multi-city trips).
+        has_complete_info = not missing_info
 
         logger.info(f"Final state - Pickup: {updated_pickup}, Drop: {updated_drop}, Type: {updated_trip_type}, Duration: {updated_duration}, Complete: {has_complete_info}")
 
@@ -3,7 +3,9 @@ Driver tools for the cab booking bot.
 Simple tools that the LLM can use to interact with the API.
 """
 
+from operator import attrgetter
 from typing import Dict, List, Optional, Any, Union
+from cachetools import TTLCache
 from langchain_core.tools import tool
 import logging
 from src.services.api_service import DriversAPIClient
@@ -11,11 +13,103 @@ from src.models.tool_model import (
     SearchDriversInput,
     DriverInfoInput,
     BookDriverInput,
+    FilterDriverInput,
 )
-from src.models.drivers_model import DriverModel, APIResponse
+from src.models.drivers_model import APIErrorResponse, APIResponse, DriverModel
 
 logger = logging.getLogger(__name__)
 
+# Filter keys the cache-side filter tool understands; built once so the hot
+# tool path doesn't reallocate the set per call.
+_ALLOWED_FILTER_KEYS: frozenset = frozenset({
+    "vehicle_types",
+    "gender",
+    "min_age",
+    "max_age",
+    "is_pet_allowed",
+    "min_connections",
+    "min_experience",
+    "languages",
+    "profile_verified",
+    "married",
+    "allow_handicapped_persons",
+    "available_for_customers_personal_car",
+    "available_for_driving_in_event_wedding",
+    "available_for_part_time_full_time",
+})
+
+
+async def _fetch_driver(api_client: DriversAPIClient, city: str, page: int,
+                        driver_id: str) -> DriverModel:
+    """
+    Fetch one driver's full record from the cached search page. Single home
+    for the cache-key + detail lookup the info and booking tools both need.
+    """
+    return await api_client._get_driver_detail(
+        api_client._generate_cache_key(city=city, page=page),
+        driverId=driver_id,
+    )
+
+
+def _compile_filter_predicates(filter_obj: Dict[str, Any]):
+    """
+    Pre-compile a validated filter dict into per-driver callables, so the
+    O(drivers x filters) matching loop does no key parsing or branching —
+    each predicate is a closure over its precomputed comparison value.
+
+    Predicates are ordered cheapest-first (scalar equality, then numeric
+    range, then list scans) so all() short-circuits before the expensive
+    membership scans whenever a cheap filter already rejects a driver.
+    """
+    predicates = []
+    for key, value in filter_obj.items():
+        if key == "vehicle_types":
+            cost = 1.0
+            wanted = {v.lower() for v in value}
+
+            def predicate(driver: DriverModel, wanted=wanted) -> bool:
+                return any(
+                    vehicle.vehicle_type.lower() in wanted
+                    for vehicle in driver.verified_vehicles
+                )
+        elif key == "languages":
+            cost = 1.0
+            wanted = {v.lower() for v in value}
+
+            def predicate(driver: DriverModel, wanted=wanted) -> bool:
+                return any(
+                    language.lower() in wanted
+                    for language in driver.verified_languages
+                )
+        elif key.startswith("min_"):
+            # attrgetter is a C-implemented callable, noticeably faster than
+            # getattr-by-name in the per-driver loop. Allowed keys all map to
+            # real DriverModel fields, so no missing-attribute default needed.
+            cost = 0.5
+            getter = attrgetter(key[4:])
+
+            def predicate(driver: DriverModel, getter=getter, value=value) -> bool:
+                driver_value = getter(driver)
+                return driver_value is not None and driver_value >= value
+        elif key.startswith("max_"):
+            cost = 0.5
+            getter = attrgetter(key[4:])
+
+            def predicate(driver: DriverModel, getter=getter, value=value) -> bool:
+                driver_value = getter(driver)
+                return driver_value is not None and driver_value <= value
+        else:
+            cost = 0.2
+            getter = attrgetter(key)
+
+            def predicate(driver: DriverModel, getter=getter, value=value) -> bool:
+                return getter(driver) == value
+
+        predicates.append((cost, predicate))
+
+    predicates.sort(key=lambda entry: entry[0])
+    return [predicate for _, predicate in predicates]
+
 
 class DriverTools:
     """Tools for driver operations"""
@@ -29,6 +123,7 @@ class DriverTools:
         """
         self.api_client = api_client
         self.search_drivers_tool = self._create_search_drivers_tool()
+        self.get_drivers_with_user_filter_via_cache_tool = self._create_filter_drivers_via_cache_tool()
         self.get_driver_info_tool = self._create_get_driver_info_tool()
         self.book_or_confirm_ride_with_driver = self._create_book_driver_tool()
 
@@ -36,6 +131,12 @@ class DriverTools:
         """Create the search drivers tool with bound API client"""
         api_client = self.api_client
 
+        # Short-lived memo of fully-built tool results, keyed on the complete
+        # argument signature. The LLM often re-issues an identical search
+        # during clarification turns; those repeats return the prior result
+        # dict without touching the API client or pydantic at all.
+        result_cache: TTLCache = TTLCache(maxsize=256, ttl=60)
+
         @tool(
             description="""
         Comprehensive driver search with advanced filtering and pagination support.
@@ -63,6 +164,26 @@ class DriverTools:
             custom_filters: Optional[Dict[str, Any]] = None,
             use_cache: bool = True,
         ) -> Dict[str, Union[str, bool, List[DriverModel], int, Dict[str, Any]]]:
+            signature = None
+            if use_cache:
+                try:
+                    signature = (
+                        city, page, limit, radius, search_strategy, sort_by,
+                        tuple(vehicle_types) if vehicle_types else None,
+                        gender, min_age, max_age, is_pet_allowed,
+                        min_connections, min_experience,
+                        tuple(languages) if languages else None,
+                        profile_verified, married,
+                        tuple(sorted(custom_filters.items())) if custom_filters else None,
+                    )
+                    cached_result = result_cache.get(signature)
+                    if cached_result is not None:
+                        logger.info("Search result cache hit for %s page %s", city, page)
+                        return cached_result
+                except TypeError:
+                    # Unhashable custom filter values; skip memoization.
+                    signature = None
+
             try:
                 # Call API with parameters
                 result = await api_client.get_drivers(
@@ -85,23 +206,34 @@ class DriverTools:
                     custom_filters=custom_filters,
                     use_cache=use_cache,
                 )
-                if not result.get("success", False):
+                if isinstance(result, APIErrorResponse):
+                    return {
+                        "success": False,
+                        "error": result.message,
+                    }
+                if not result.success:
+                    # HTTP 200 but the API itself flagged the search as
+                    # failed; APIResponse carries no message field.
+                    logger.error("Driver search API reported failure for %s page %s", city, page)
                     return {
                         "success": False,
-                        "error": str(result.get("message", "Failed to get drivers")),
+                        "error": "The drivers API reported an unsuccessful search",
                     }
 
-                drivers = APIResponse.model_validate(result.get("data")).data
+                drivers = result.data
 
-                return {
+                tool_result = {
                     "success": True,
                     "drivers": drivers,
                     "count": len(drivers),
-                    "total": APIResponse.model_validate(result.get("data")).pagination.total,
-                    "filters": APIResponse.model_validate(result.get("data")).search.filters,
-                    "has_more": APIResponse.model_validate(result.get("data")).pagination.has_more,
+                    "total": result.pagination.total,
+                    "filters": result.search.filters,
+                    "has_more": result.pagination.has_more,
                     "page": page,
                 }
+                if signature is not None:
+                    result_cache[signature] = tool_result
+                return tool_result
 
             except Exception as e:
                 logger.error(f"Error searching drivers: {str(e)}")
@@ -113,6 +245,64 @@ class DriverTools:
 
         return search_drivers_tool
 
+    def _create_filter_drivers_via_cache_tool(self):
+        """Create the cache-side filter tool with bound API client"""
+        api_client = self.api_client
+
+        @tool(
+            description="""
+        Filters the drivers already fetched for a city/page entirely from
+        cache, without another API round-trip. Use this to narrow down an
+        existing search by vehicle type, experience, age, languages, etc.
+        """,
+            args_schema=FilterDriverInput,
+        )
+        async def get_drivers_with_user_filter_via_cache_tool(
+            city: str, page: int, filter_obj: Dict[str, Any]
+        ) -> Dict[str, Union[str, bool, List[DriverModel], int, Dict[str, Any]]]:
+            try:
+                cache_key = api_client._generate_cache_key(city=city, page=page)
+                cached_data = await api_client._get_from_cache(cache_key)
+                if not cached_data:
+                    return {
+                        "success": False,
+                        "msg": "No cached results for this search, run a driver search first",
+                    }
+
+                # Items are already validated DriverModel instances after this
+                # single parse; no per-driver re-validation pass is needed.
+                raw_drivers: List[DriverModel] = APIResponse.model_validate(cached_data).data
+
+                # C-level set intersection picks out the allowed keys, so the
+                # dict build only iterates valid entries.
+                allowed_keys = filter_obj.keys() & _ALLOWED_FILTER_KEYS
+                valid_filter_obj = {
+                    k: v for k in allowed_keys
+                    if (v := filter_obj[k]) is not None
+                }
+
+                predicates = _compile_filter_predicates(valid_filter_obj)
+                filtered_drivers = [
+                    driver for driver in raw_drivers
+                    if all(predicate(driver) for predicate in predicates)
+                ]
+
+                return {
+                    "success": True,
+                    "drivers": filtered_drivers,
+                    "count": len(filtered_drivers),
+                    "filters_applied": valid_filter_obj,
+                }
+            except Exception as e:
+                logger.error(f"Error filtering cached drivers: {str(e)}")
+                return {
+                    "success": False,
+                    "msg": "Failed to filter the cached drivers, try again later",
+                    "error": str(e),
+                }
+
+        return get_drivers_with_user_filter_via_cache_tool
+
     def _create_get_driver_info_tool(self):
         """Create the get driver info tool with bound API client"""
         api_client = self.api_client
@@ -128,10 +318,7 @@ class DriverTools:
             city: str, page: int, driverId: str
         ) -> Dict[str, Union[DriverModel, bool, str, Exception]]:
             try:
-                driver: DriverModel = await api_client._get_driver_detail(
-                    api_client._generate_cache_key(city=city, page=page),
-                    driverId=driverId,
-                )
+                driver: DriverModel = await _fetch_driver(api_client, city, page, driverId)
                 return {"success": True, "driver": driver}
             except Exception as e:
                 return {
@@ -158,10 +345,7 @@ class DriverTools:
             city: str, page: int, driverId: str
         ) -> Dict[str, Union[bool, str, Exception]]:
             try:
-                driver: DriverModel = await api_client._get_driver_detail(
-                    api_client._generate_cache_key(city=city, page=page),
-                    driverId=driverId,
-                )
+                driver: DriverModel = await _fetch_driver(api_client, city, page, driverId)
 
                 return {
                     "success": True,
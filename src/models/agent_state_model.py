@@ -6,6 +6,29 @@ class DriverDetailsForState(TypedDict):
     driver_id: str
     driver_name: str
 
+
+def append_message(state: "AgentState", msg: BaseMessage) -> BaseMessage:
+    """
+    Append a message to the conversation history, pre-computing its
+    "type: content" history line once at write time so nodes that render
+    the history don't re-format every message on every turn.
+    """
+    msg._formatted = f"{msg.type}: {msg.content}"
+    state["messages"].append(msg)
+    return msg
+
+
+def formatted_line(msg: BaseMessage) -> str:
+    """
+    Return the pre-computed "type: content" line for a message, formatting
+    (and caching) lazily for messages that weren't appended via append_message.
+    """
+    line = getattr(msg, "_formatted", None)
+    if line is None:
+        line = f"{msg.type}: {msg.content}"
+        msg._formatted = line
+    return line
+
 class AgentState(TypedDict):
     """
     Represents the state of the conversation and agent's memory.
@@ -1,5 +1,5 @@
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, computed_field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict
 
 
 class PhotoUrl(BaseModel):
@@ -10,7 +10,7 @@ class PhotoUrl(BaseModel):
 
 
 class Photo(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
 
     mob: Optional[PhotoUrl] = Field(None)
     thumb: Optional[PhotoUrl] = Field(None)
@@ -20,7 +20,7 @@ class Photo(BaseModel):
 
 
 class VehicleImage(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
 
     mob: Optional[PhotoUrl] = Field(None)
     thumb: Optional[PhotoUrl] = Field(None)
@@ -33,7 +33,7 @@ class VehicleImage(BaseModel):
 
 
 class VerifiedVehicle(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
 
     images: List[VehicleImage]
     reg_no: str
@@ -46,7 +46,7 @@ class VerifiedVehicle(BaseModel):
 
 
 class Membership(BaseModel):
-    model_config = ConfigDict(extra="ignore")
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
 
     plan: Optional[str] = Field(None)
     duration: Optional[int] = Field(None)
@@ -110,12 +110,14 @@ class DriverModel(BaseModel):
     profile_url: str = Field(alias="profileUrl", default="")
     qr_code_url: str = Field(alias="qrCodeUrl")
     membership: Membership
-    metadata_photos_arrangement: List[Any] = Field(alias="metadataPhotosArrangement")
-    metadata_prominent_indexes: List[Any] = Field(alias="metadataProminentIndexes")
+    # Bare list skips pydantic's per-element validation loop; these arrays
+    # are opaque metadata the bot never reads item-by-item.
+    metadata_photos_arrangement: list = Field(alias="metadataPhotosArrangement")
+    metadata_prominent_indexes: list = Field(alias="metadataProminentIndexes")
     current_location: List[float] = Field(alias="currentLocation")
-    location: List[Any]
+    location: list
 
-    @computed_field
+    @property
     def constructed_profile_url(self) -> str:
         """Construct the profile URL from username"""
         return f"https://cabswale.ai/profile/{self.username}"
@@ -124,6 +126,8 @@ class DriverModel(BaseModel):
 
 
 class Pagination(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
     page: int
     limit: int
     total: int
@@ -136,6 +140,8 @@ class SearchCoordinates(BaseModel):
 
 
 class Search(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
     city: str
     coordinates: SearchCoordinates
     radius: str
@@ -150,3 +156,10 @@ class APIResponse(BaseModel):
     data: List[DriverModel]
     pagination: Pagination
     search: Search
+
+
+class APIErrorResponse(BaseModel):
+    """Typed error returned by the API client instead of an ad-hoc dict"""
+
+    success: bool = False
+    message: str
@@ -1,10 +1,12 @@
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class BookDriverInput(BaseModel):
     """Input Schema for Driver booked or chosen by user"""
 
+    model_config = ConfigDict(defer_build=True)
+
     city: str = Field(
         ...,
         description="City where the driver operates or currently in (required for cache key generation)",
@@ -24,6 +26,8 @@ class BookDriverInput(BaseModel):
 class FilterDriverInput(BaseModel):
     """Input schema for filtering drivers based on user requirements"""
 
+    model_config = ConfigDict(defer_build=True)
+
     city: str = Field(
         ...,
         description="City name where drivers are being searched (e.g., 'delhi', 'mumbai')",
@@ -60,6 +64,8 @@ class FilterDriverInput(BaseModel):
 class DriverInfoInput(BaseModel):
     """Input schema for retrieving specific driver information"""
 
+    model_config = ConfigDict(defer_build=True)
+
     city: str = Field(
         ...,
         description="City where the driver operates or currently in (required for cache key generation)",
@@ -79,6 +85,8 @@ class DriverInfoInput(BaseModel):
 class SearchDriversInput(BaseModel):
     """Input schema for searching drivers with comprehensive filtering options"""
 
+    model_config = ConfigDict(defer_build=True)
+
     city: str = Field(
         ...,
         description="City name for driver search (e.g., 'delhi', 'mumbai', 'bangalore')",
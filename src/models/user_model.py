@@ -1,8 +1,11 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List
 
 
 class UserModel(BaseModel):
+    # Not validated on any startup path; compile the schema on first use.
+    model_config = ConfigDict(defer_build=True)
+
     id: str
     username: str
     name: str
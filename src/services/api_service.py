@@ -1,8 +1,10 @@
+import asyncio
 import httpx
-from typing import Dict, Any, List, Optional, Union
+from typing import Any, ClassVar, Dict, List, Optional, Union
 from datetime import timedelta
 import logging
-from src.models.drivers_model import DriverModel, APIResponse
+from cachetools import TTLCache
+from src.models.drivers_model import APIErrorResponse, APIResponse, DriverModel
 from src.services.cache_service import RedisService
 
 logger = logging.getLogger(__name__)
@@ -11,48 +13,133 @@ logger = logging.getLogger(__name__)
 class DriversAPIClient:
     """Client for interacting with the Premium Drivers API"""
 
+    # One pooled client shared by every session's API client, so concurrent
+    # sessions reuse the same connections instead of each paying a fresh
+    # pool and TLS handshake to the cloud function.
+    _shared_client: ClassVar[Optional[httpx.AsyncClient]] = None
+
+    @classmethod
+    def _get_client(cls) -> httpx.AsyncClient:
+        """Lazily create the process-wide HTTP client"""
+        if cls._shared_client is None or cls._shared_client.is_closed:
+            # HTTP/2 multiplexes concurrent session requests over one
+            # connection instead of head-of-line blocking on HTTP/1.1, and
+            # the keepalive pool amortizes TLS handshakes across requests.
+            # Granular timeouts: fail fast on connect/pool contention instead
+            # of letting a flat 30s budget mask a dead endpoint.
+            cls._shared_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=50,
+                    max_connections=100,
+                    keepalive_expiry=30.0,
+                ),
+            )
+        return cls._shared_client
+
     def __init__(self, session_id: str, redis_service: RedisService, cache_duration_minutes: int = 10):
         self.base_url = "https://us-central1-cabswale-ai.cloudfunctions.net"
         self.endpoint = "/cabbot-botApiGetPremiumDrivers"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = self._get_client()
         self.redis_service = redis_service
         self.cache_duration = timedelta(minutes=cache_duration_minutes)
         self.session_id = session_id
 
+        # In-process layer over the Redis cache holding already-parsed
+        # APIResponse objects, so repeat hits on the same city/page skip both
+        # the Redis round-trip and the full pydantic re-validation. TTLCache
+        # evicts in O(1) and stays bounded across long sessions.
+        self._parsed_cache: TTLCache = TTLCache(
+            maxsize=256, ttl=self.cache_duration.total_seconds()
+        )
+        # City -> parsed-cache keys, so clear_cache(city) pops exactly the
+        # keys for that city instead of scanning the whole cache.
+        self._city_keys: Dict[str, set] = {}
+        # cache_key -> {driver_id: DriverModel}, built once per page so
+        # repeated detail lookups are a dict probe instead of a page rescan.
+        self._id_index: TTLCache = TTLCache(
+            maxsize=256, ttl=self.cache_duration.total_seconds()
+        )
+
+        # Single-flight map: concurrent misses on the same cache key share
+        # one HTTP request instead of each firing their own.
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Strong refs to fire-and-forget prefetch tasks so the event loop
+        # doesn't garbage-collect them mid-fetch.
+        self._prefetch_tasks: set = set()
+
     def _generate_cache_key(self, city: str, page: int) -> str:
         """Generate a cache key from parameters"""
-        return f"{self.session_id}_{city}_{page}"
+        # domain:id:sub scheme; colons can't appear in session ids or city
+        # names, so the key parses unambiguously (underscores could).
+        return f"drivers:{self.session_id}:{city}:{page}"
+
+    @staticmethod
+    def _detail_cache_key(cache_key: str) -> str:
+        """Key of the per-driver hash stored alongside a cached page"""
+        return "drivers_by_id" + cache_key[len("drivers"):]
+
+    def _remember_parsed(self, cache_key: str, api_response: APIResponse) -> None:
+        """Store a parsed response and index its key by city for clearing"""
+        self._parsed_cache[cache_key] = api_response
+        city = cache_key.rsplit(":", 2)[-2]
+        self._city_keys.setdefault(city, set()).add(cache_key)
 
     async def _get_from_cache(self, cache_key: str) -> Union[Dict[str, Any], None]:
-        """Get data from cache if not expired"""
-        cached_data = await self.redis_service.get(cache_key)
+        """Get data from cache if not expired, sliding the TTL on a hit"""
+        cached_data = await self.redis_service.get_and_refresh(
+            cache_key, int(self.cache_duration.total_seconds())
+        )
         if cached_data:
-            logger.info(f"Cache hit for key: {cache_key}")
+            logger.info("Cache hit for key: %s", cache_key)
             return cached_data
         return None
 
     async def _save_to_cache(self, cache_key: str, data: APIResponse):
         """Save data to cache with expiration"""
+        ttl = int(self.cache_duration.total_seconds())
         await self.redis_service.set(
-            cache_key, data.model_dump(by_alias=True), expiration_seconds=int(self.cache_duration.total_seconds())
+            cache_key, data.model_dump(by_alias=True), expiration_seconds=ttl
+        )
+        # Side hash of the same page keyed by driver id, so a detail lookup
+        # after a cold start pulls one driver instead of the whole page.
+        await self.redis_service.hset_ex(
+            self._detail_cache_key(cache_key),
+            {driver.id: driver.model_dump(by_alias=True) for driver in data.data},
+            expiration_seconds=ttl,
         )
-        logger.info(f"Cached data for key: {cache_key}")
+        logger.info("Cached data for key: %s", cache_key)
 
     async def _get_driver_detail(self, cache_key: str, driverId: str) -> DriverModel:
         """Get specific driver details from cache"""
-        drivers_from_cache = await self._get_from_cache(cache_key)
-        if not drivers_from_cache:
-            raise ValueError(f"No cached data found for cache key: {cache_key}")
-
-        # Parse the cached response
-        api_response = APIResponse.model_validate(drivers_from_cache)
-
-        # Find the specific driver
-        for driver in api_response.data:
-            if driverId == driver.id:
-                return driver
-
-        raise ValueError(f"Driver with ID {driverId} not found in cached data")
+        index = self._id_index.get(cache_key)
+        if index is None:
+            api_response = self._parsed_cache.get(cache_key)
+            if api_response is None:
+                # Cold start: try the per-driver hash first — one driver's
+                # payload instead of the full page.
+                driver_data = await self.redis_service.hget(
+                    self._detail_cache_key(cache_key), driverId
+                )
+                if driver_data:
+                    return DriverModel.model_validate(driver_data)
+
+                drivers_from_cache = await self._get_from_cache(cache_key)
+                if not drivers_from_cache:
+                    raise ValueError(f"No cached data found for cache key: {cache_key}")
+
+                # Parse the cached response
+                api_response = APIResponse.model_validate(drivers_from_cache)
+                self._remember_parsed(cache_key, api_response)
+
+            index = {driver.id: driver for driver in api_response.data}
+            self._id_index[cache_key] = index
+
+        driver = index.get(driverId)
+        if driver is None:
+            raise ValueError(f"Driver with ID {driverId} not found in cached data")
+        return driver
 
     def _build_driver_filters(
         self,
@@ -72,31 +159,30 @@ class DriversAPIClient:
         filters: Dict[str, Any] = {}
         logger.debug("Building driver filters")
 
-        optional_list_filters = {
-            "vehicleTypes": vehicle_types,
-            "verifiedLanguages": languages,
-        }
-
-        for key, val in optional_list_filters.items():
-            if val:
-                filters[key] = ",".join(val)
-
-        optional_simple_filters = {
-            "gender": gender,
-            "minAge": min_age,
-            "maxAge": max_age,
-            "minConnections": min_connections,
-            "minExperience": min_experience,
-            "profileVerified": profile_verified,
-            "married": married,
-        }
-
-        for key, val in optional_simple_filters.items():
-            if val is not None:
-                filters[key] = val
+        # Insert directly instead of building throwaway name->value dicts and
+        # looping over them on every call.
+        if vehicle_types:
+            filters["vehicleTypes"] = ",".join(vehicle_types)
+        if languages:
+            filters["verifiedLanguages"] = ",".join(languages)
+
+        if gender is not None:
+            filters["gender"] = gender
+        if min_age is not None:
+            filters["minAge"] = min_age
+        if max_age is not None:
+            filters["maxAge"] = max_age
+        if min_connections is not None:
+            filters["minConnections"] = min_connections
+        if min_experience is not None:
+            filters["minExperience"] = min_experience
+        if profile_verified is not None:
+            filters["profileVerified"] = profile_verified
+        if married is not None:
+            filters["married"] = married
 
         if is_pet_allowed is not None:
-            filters["isPetAllowed"] = str(is_pet_allowed).lower()
+            filters["isPetAllowed"] = "true" if is_pet_allowed else "false"
 
         if custom_filters:
             filters.update(custom_filters)
@@ -123,7 +209,8 @@ class DriversAPIClient:
         custom_filters: Optional[Dict[str, Any]] = None,
         married: Optional[bool] = None,
         use_cache: bool = True,
-    ) -> Dict[str, Union[str, int, bool, APIResponse]]:
+        prefetch_pages: int = 0,
+    ) -> Union[APIResponse, APIErrorResponse]:
         """
         Fetch premium drivers with various filters
 
@@ -145,96 +232,193 @@ class DriversAPIClient:
             profile_verified: Filter by profile verification status
             custom_filters: Additional custom filters as dict
             use_cache: Whether to use cache (default True)
+            prefetch_pages: Pages after this one to fetch in the background
 
         Returns:
-            API response as dictionary or error response
+            The parsed APIResponse, or an APIErrorResponse on failure
         """
-        # Build query parameters
-        params = {
-            "city": city,
-            "page": page,
-            "limit": limit,
-            "radius": radius,
-            "searchStrategy": search_strategy,
-            "sortBy": sort_by,
-        }
-
-        # Add optional filters
-        filters = self._build_driver_filters(
-            vehicle_types=vehicle_types,
-            gender=gender,
-            min_age=min_age,
-            max_age=max_age,
-            is_pet_allowed=is_pet_allowed,
-            min_connections=min_connections,
-            min_experience=min_experience,
-            languages=languages,
-            profile_verified=profile_verified,
-            married=married,
-            custom_filters=custom_filters,
-        )
-        params.update(filters)
-        # print("\n\nPARAMS:\n\n", params)
-        logger.debug(f"Filters applied: {filters}")
+        # Computed once; the post-fetch caching branch reuses it.
+        cache_key = self._generate_cache_key(city, page)
+
+        result: Union[APIResponse, APIErrorResponse, None] = None
 
         # Check cache first if enabled
         if use_cache:
-            cache_key = self._generate_cache_key(city, page)
-            cached_data = await self._get_from_cache(cache_key)
-
-            if cached_data:
-                # Convert cached data to APIResponse
-                api_response = APIResponse.model_validate(cached_data)
-                return {"success": True, "data": api_response}
+            api_response = self._parsed_cache.get(cache_key)
+            if api_response is not None:
+                logger.info("In-process cache hit for key: %s", cache_key)
+                result = api_response
+            else:
+                cached_data = await self._get_from_cache(cache_key)
+                if cached_data:
+                    # Convert cached data to APIResponse
+                    api_response = APIResponse.model_validate(cached_data)
+                    self._remember_parsed(cache_key, api_response)
+                    result = api_response
+
+        if result is None:
+            inflight = self._inflight.get(cache_key) if use_cache else None
+            if inflight is not None:
+                # Another caller is already fetching this page; share its
+                # result. shield() keeps our own cancellation from killing
+                # the fetch under the other waiters.
+                logger.info("Joining in-flight fetch for key: %s", cache_key)
+                result = await asyncio.shield(inflight)
+
+        if result is None:
+            # Build query parameters only now that a real fetch is needed;
+            # cache hits and joined fetches never pay for this.
+            params = {
+                "city": city,
+                "page": page,
+                "limit": limit,
+                "radius": radius,
+                "searchStrategy": search_strategy,
+                "sortBy": sort_by,
+            }
 
+            # Add optional filters
+            filters = self._build_driver_filters(
+                vehicle_types=vehicle_types,
+                gender=gender,
+                min_age=min_age,
+                max_age=max_age,
+                is_pet_allowed=is_pet_allowed,
+                min_connections=min_connections,
+                min_experience=min_experience,
+                languages=languages,
+                profile_verified=profile_verified,
+                married=married,
+                custom_filters=custom_filters,
+            )
+            params.update(filters)
+            logger.debug("Filters applied: %s", filters)
+
+            if use_cache:
+                task = asyncio.ensure_future(
+                    self._fetch_and_cache(cache_key, params, use_cache)
+                )
+                self._inflight[cache_key] = task
+                try:
+                    result = await task
+                finally:
+                    self._inflight.pop(cache_key, None)
+            else:
+                result = await self._fetch_and_cache(cache_key, params, use_cache)
+
+        if (
+            prefetch_pages > 0
+            and isinstance(result, APIResponse)
+            and result.pagination.has_more
+        ):
+            self._schedule_prefetch(
+                range(page + 1, page + 1 + prefetch_pages),
+                dict(
+                    city=city,
+                    limit=limit,
+                    radius=radius,
+                    search_strategy=search_strategy,
+                    sort_by=sort_by,
+                    vehicle_types=vehicle_types,
+                    gender=gender,
+                    min_age=min_age,
+                    max_age=max_age,
+                    is_pet_allowed=is_pet_allowed,
+                    min_connections=min_connections,
+                    min_experience=min_experience,
+                    languages=languages,
+                    profile_verified=profile_verified,
+                    custom_filters=custom_filters,
+                    married=married,
+                    use_cache=use_cache,
+                ),
+            )
+
+        return result
+
+    async def _fetch_and_cache(
+        self, cache_key: str, params: Dict[str, Any], use_cache: bool
+    ) -> Union[APIResponse, APIErrorResponse]:
+        """Fetch one page from the API and cache a successful response"""
         try:
             url = f"{self.base_url}{self.endpoint}"
-            logger.info(f"Fetching premium drivers from: {url} with params: {params}")
+            logger.info("Fetching premium drivers from: %s with params: %s", url, params)
 
             response = await self.client.get(url, params=params)
             response.raise_for_status()
 
-            data: APIResponse = APIResponse.model_validate(response.json())
+            # Validate straight from the response bytes: pydantic-core's JSON
+            # parser builds the models in one pass, skipping the intermediate
+            # dict tree that response.json() would materialize first.
+            data: APIResponse = APIResponse.model_validate_json(response.content)
 
             # Cache successful response
             if use_cache and data.success:
-                cache_key = self._generate_cache_key(city, page)
+                self._remember_parsed(cache_key, data)
                 await self._save_to_cache(cache_key, data)
 
-            return {"success": True, "data": data}
+            return data
 
         except httpx.HTTPStatusError as e:
             error_msg = f"HTTP error {e.response.status_code}: {e.response.text}"
             logger.error(error_msg)
-            return {
-                "success": False,
-                "message": error_msg,
-            }
+            return APIErrorResponse(message=error_msg)
         except httpx.RequestError as e:
             error_msg = f"Request failed: {str(e)}"
             logger.error(error_msg)
-            return {"success": False, "message": error_msg}
+            return APIErrorResponse(message=error_msg)
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             logger.error(error_msg)
-            return {"success": False, "message": error_msg}
+            return APIErrorResponse(message=error_msg)
+
+    def _schedule_prefetch(self, pages: range, request_kwargs: Dict[str, Any]) -> None:
+        """Kick off background fetches for upcoming pages without awaiting"""
+        for next_page in pages:
+            next_key = self._generate_cache_key(request_kwargs["city"], next_page)
+            if next_key in self._parsed_cache or next_key in self._inflight:
+                continue
+            task = asyncio.ensure_future(self.get_drivers(page=next_page, **request_kwargs))
+            self._prefetch_tasks.add(task)
+            task.add_done_callback(self._prefetch_tasks.discard)
 
     async def clear_cache(self, city: Optional[str] = None):
         """Clear cache for specific city or all cache"""
         if city:
-            # Clear cache for specific city
-            keys_to_remove = [k async for k in self.redis_service.redis_client.scan_iter(f"*_{city}_*")]
-            if keys_to_remove:
-                await self.redis_service.redis_client.delete(*keys_to_remove)
-            logger.info(f"Cleared cache for city: {city}")
+            # Clear cache for specific city. Stream SCAN results in fixed
+            # batches and UNLINK them, so large key sets neither pile up in
+            # one huge command nor block Redis on synchronous frees.
+            redis_client = self.redis_service.redis_client
+            batch: List[str] = []
+            async for key in redis_client.scan_iter(match=f"drivers*:*:{city}:*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await redis_client.unlink(*batch)
+                    batch.clear()
+            if batch:
+                await redis_client.unlink(*batch)
+            for key in self._city_keys.pop(city, ()):
+                self._parsed_cache.pop(key, None)
+                self._id_index.pop(key, None)
+            logger.info("Cleared cache for city: %s", city)
         else:
             # Clear all cache
             await self.redis_service.clear_all()
+            self._parsed_cache.clear()
+            self._city_keys.clear()
+            self._id_index.clear()
             logger.info("Cleared all cache")
 
     async def close(self):
-        """Close HTTP client"""
-        await self.client.aclose()
+        """Close the shared HTTP client at app shutdown"""
+        await type(self).aclose_shared()
+
+    @classmethod
+    async def aclose_shared(cls):
+        """Close the process-wide HTTP client; recreated lazily if needed"""
+        if cls._shared_client is not None:
+            await cls._shared_client.aclose()
+            cls._shared_client = None
 
     async def __aenter__(self):
         """Async context manager entry"""
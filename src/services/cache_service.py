@@ -1,15 +1,25 @@
 import redis.asyncio
 import os
-import json
+import orjson
+import zstandard
 from typing import Optional, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 1-byte codec tags so a reader knows how a stored value was encoded.
+# Neither collides with a JSON start byte, so untagged legacy values are
+# still recognized.
+_CODEC_RAW = b"R"
+_CODEC_ZSTD = b"Z"
+# Only payloads bigger than this are worth the compression round-trip.
+_COMPRESS_THRESHOLD = 1024
+
 class RedisService:
     """A service for interacting with Redis for caching."""
 
-    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0):
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 0,
+                 max_connections: int = 32):
         """
         Initializes the RedisService.
 
@@ -25,13 +35,44 @@ class RedisService:
             self.redis_host = host
             self.redis_port = port
 
-        self.redis_client = redis.asyncio.Redis(
+        # Explicitly sized pool so concurrent sessions neither serialize
+        # through a single connection nor open an unbounded number of them.
+        # With the hiredis extra installed, redis-py picks its C reply parser
+        # automatically.
+        self.connection_pool = redis.asyncio.ConnectionPool(
             host=self.redis_host,
             port=self.redis_port,
             db=db,
-            decode_responses=True  # Decode responses to UTF-8
+            max_connections=max_connections,
+            health_check_interval=30,
+            # Raw bytes in and out: orjson serializes straight to bytes and
+            # parses them back, so the UTF-8 decode layer is pure overhead.
+            decode_responses=False,
+        )
+        self.redis_client = redis.asyncio.Redis(
+            connection_pool=self.connection_pool,
         )
 
+        # Reused across calls; constructing these per operation is costly.
+        self._compressor = zstandard.ZstdCompressor(level=3)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def _encode_value(self, value: Any) -> bytes:
+        """Serialize a value, zstd-compressing payloads past the threshold."""
+        payload = orjson.dumps(value)
+        if len(payload) > _COMPRESS_THRESHOLD:
+            return _CODEC_ZSTD + self._compressor.compress(payload)
+        return _CODEC_RAW + payload
+
+    def _decode_value(self, payload: bytes) -> Any:
+        """Reverse _encode_value, tolerating untagged legacy values."""
+        tag = payload[:1]
+        if tag == _CODEC_ZSTD:
+            return orjson.loads(self._decompressor.decompress(payload[1:]))
+        if tag == _CODEC_RAW:
+            return orjson.loads(payload[1:])
+        return orjson.loads(payload)
+
     async def set(self, key: str, value: Any, expiration_seconds: int = 300):
         """
         Sets a value in the Redis cache.
@@ -42,7 +83,7 @@ class RedisService:
             expiration_seconds: The expiration time for the key in seconds.
         """
         try:
-            serialized_value = json.dumps(value)
+            serialized_value = self._encode_value(value)
             await self.redis_client.setex(key, expiration_seconds, serialized_value)
         except redis.RedisError as e:
             logger.error(f"Error setting cache for key {key}: {e}")
@@ -62,12 +103,120 @@ class RedisService:
         try:
             cached_value = await self.redis_client.get(key)
             if cached_value:
-                return json.loads(cached_value)
+                return self._decode_value(cached_value)
             return None
         except redis.RedisError as e:
             logger.error(f"Error getting cache for key {key}: {e}")
             return None
 
+    async def get_and_refresh(self, key: str, expiration_seconds: int = 300) -> Optional[Any]:
+        """
+        Gets a value and slides its expiration, in a single round-trip.
+
+        Keys that keep getting hit stay resident for another full TTL;
+        keys nobody reads expire on the original schedule.
+
+        Args:
+            key: The cache key.
+            expiration_seconds: The fresh expiration to apply on a hit.
+
+        Returns:
+            The deserialized value if the key exists, otherwise None.
+        """
+        try:
+            # GETEX (Redis 6.2+) reads and re-arms the TTL as one atomic
+            # command — half the commands of a GET+EXPIRE pipeline.
+            cached_value = await self.redis_client.getex(key, ex=expiration_seconds)
+            if cached_value:
+                return self._decode_value(cached_value)
+            return None
+        except redis.RedisError as e:
+            logger.error(f"Error getting cache for key {key}: {e}")
+            return None
+
+    async def mget(self, keys: list) -> list:
+        """
+        Gets several values from the Redis cache in one round-trip.
+
+        Args:
+            keys: The cache keys to fetch.
+
+        Returns:
+            A list aligned with `keys`; missing entries are None.
+        """
+        if not keys:
+            return []
+        try:
+            cached_values = await self.redis_client.mget(keys)
+            return [
+                self._decode_value(value) if value else None
+                for value in cached_values
+            ]
+        except redis.RedisError as e:
+            logger.error(f"Error getting cache for keys {keys}: {e}")
+            return [None] * len(keys)
+
+    async def mset_ex(self, mapping: dict, expiration_seconds: int = 300):
+        """
+        Sets several values in the Redis cache with one network exchange.
+
+        Args:
+            mapping: Cache key -> value (values are JSON serialized).
+            expiration_seconds: The expiration time for every key in seconds.
+        """
+        if not mapping:
+            return
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.setex(key, expiration_seconds, self._encode_value(value))
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error setting cache for keys {list(mapping)}: {e}")
+
+    async def hset_ex(self, key: str, mapping: dict, expiration_seconds: int = 300):
+        """
+        Stores a field -> value hash with an expiry, in one network exchange.
+
+        Args:
+            key: The hash key.
+            mapping: Field -> value (values are JSON serialized).
+            expiration_seconds: The expiration time for the hash in seconds.
+        """
+        if not mapping:
+            return
+        try:
+            encoded = {
+                field: self._encode_value(value)
+                for field, value in mapping.items()
+            }
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.hset(key, mapping=encoded)
+                pipe.expire(key, expiration_seconds)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error setting hash for key {key}: {e}")
+
+    async def hget(self, key: str, field: str) -> Optional[Any]:
+        """
+        Gets a single field from a cached hash.
+
+        Args:
+            key: The hash key.
+            field: The field to fetch.
+
+        Returns:
+            The deserialized value if present, otherwise None.
+        """
+        try:
+            value = await self.redis_client.hget(key, field)
+            if value:
+                return self._decode_value(value)
+            return None
+        except redis.RedisError as e:
+            logger.error(f"Error getting hash field {field} for key {key}: {e}")
+            return None
+
     async def delete(self, key: str):
         """
         Deletes a key from the Redis cache.
@@ -0,0 +1,478 @@
+import asyncio
+import redis.asyncio
+import os
+import time
+from datetime import datetime
+from typing import Optional, Any, Dict, List
+import logging
+
+import msgspec
+import zstandard as zstd
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the persisted state layout changes incompatibly.
+STATE_VERSION = "1.0"
+
+# Single-byte codec tag prefixed to persisted blobs, so the wire format can
+# evolve without breaking entries written by older processes.
+_CODEC_ZSTD = b"\x01"
+
+# Metadata stamped at save time. Excluded from change fingerprints, because a
+# state loaded via get_state carries the previous save's stamp and including
+# it would make every save look dirty.
+_STAMP_KEYS = ("last_updated_ns", "state_version")
+
+
+class StateManager:
+    """
+    Persists per-session agent state in Redis so conversations survive
+    process restarts, with an in-memory fallback for environments where
+    Redis is unavailable (e.g. local development without Docker).
+
+    States are expected to be dicts of msgpack-compatible primitives;
+    anything else is stringified on encode.
+    """
+
+    def __init__(self, host: str = 'localhost', port: int = 6379, db: int = 1,
+                 session_ttl_seconds: int = 3600, max_connections: int = 64,
+                 coalesce_writes: bool = False, flush_interval_ms: int = 10):
+        """
+        Initializes the StateManager.
+
+        Args:
+            host: Redis host for local development.
+            port: Redis port for local development.
+            db: Redis database index (kept separate from the response cache).
+            session_ttl_seconds: How long an idle session is retained.
+            max_connections: Pool size; size to the expected number of
+                concurrent sessions issuing commands in flight.
+            coalesce_writes: Buffer save_state writes and flush them in
+                batched pipelines. Trades a durability window of at most
+                flush_interval_ms for much higher write throughput; call
+                flush() where durability matters (e.g. after a booking).
+            flush_interval_ms: Coalescing window for buffered writes.
+        """
+        if os.environ.get('GOOGLE_CLOUD_PROJECT'):
+            # Production environment on Google Cloud
+            self.redis_host = os.environ.get('REDIS_HOST', 'localhost')
+            self.redis_port = int(os.environ.get('REDIS_PORT', 6379))
+        else:
+            # Local development environment (e.g., with Docker)
+            self.redis_host = host
+            self.redis_port = port
+
+        # An explicitly sized pool keeps concurrent pipelines from serializing
+        # on a single socket; health checks drop stale connections.
+        pool = redis.asyncio.ConnectionPool(
+            host=self.redis_host,
+            port=self.redis_port,
+            db=db,
+            max_connections=max_connections,
+            health_check_interval=30,
+            decode_responses=False  # Values are binary msgpack blobs
+        )
+        self.redis_client = redis.asyncio.Redis(connection_pool=pool)
+
+        # Pre-bound method references skip the repeated LOAD_ATTR chain on
+        # the per-turn hot paths.
+        self._redis_pipeline = self.redis_client.pipeline
+        self._redis_setex = self.redis_client.setex
+        self._redis_expire = self.redis_client.expire
+        self.session_ttl = session_ttl_seconds
+
+        # msgpack encoder/decoder are created once and reused; msgpack is both
+        # faster and smaller than a pickle/json round-trip for small dict
+        # payloads, and never executes arbitrary code on load.
+        self._enc = msgspec.msgpack.Encoder(enc_hook=str)
+        self._dec = msgspec.msgpack.Decoder()
+
+        # Chat histories repeat the same JSON keys and driver records heavily;
+        # zstd at level 3 compresses them several-fold at GB/s, cutting both
+        # Redis memory and bytes across the socket.
+        self._zc = zstd.ZstdCompressor(level=3)
+        self._zd = zstd.ZstdDecompressor()
+
+        # In-memory fallback used when Redis is unreachable. TTLCache bounds
+        # memory (amortized O(1) eviction on insert) and tracks expiry itself,
+        # so entries need no manual {"state", "expires"} wrapping.
+        self.memory_store: TTLCache = TTLCache(maxsize=10000, ttl=session_ttl_seconds)
+
+        # Fingerprint of the last payload written per key, so saves that
+        # didn't actually change the state only refresh the TTL instead of
+        # recompressing and reshipping the whole blob.
+        self._last_saved: TTLCache = TTLCache(maxsize=10000, ttl=session_ttl_seconds)
+
+        # Write-coalescing buffer; the queue and flusher task are created
+        # lazily so the constructor doesn't need a running event loop.
+        self._coalesce_writes = coalesce_writes
+        self._flush_interval = flush_interval_ms / 1000
+        self._flush_batch_size = 100
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
+
+        # Keys are built as bytes the client passes straight through,
+        # skipping the per-call f-string and encode.
+        self._key_prefix = b"cabbot:state:"
+        self._key_prefix_len = len(self._key_prefix)
+
+    def _get_state_key(self, session_id: str) -> bytes:
+        """Build the Redis key for a session's state."""
+        return self._key_prefix + session_id.encode()
+
+    def _serialize_state(self, state: Dict[str, Any]) -> bytes:
+        """Encode a state dict to a zstd-compressed msgpack blob."""
+        return _CODEC_ZSTD + self._zc.compress(self._enc.encode(state))
+
+    def _deserialize_state(self, data: bytes) -> Dict[str, Any]:
+        """Decode a persisted blob back to a state dict."""
+        if data[:1] == _CODEC_ZSTD:
+            return self._dec.decode(self._zd.decompress(data[1:]))
+        # Legacy entry written before compression landed: raw msgpack.
+        return self._dec.decode(data)
+
+    def _compress_state(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Trim unbounded sequences and drop stale temporary keys before a state
+        is persisted, so long conversations don't grow the payload forever.
+        Keeps the first 5 messages (trip context) plus the most recent 15.
+        Returns the original dict untouched when nothing needs trimming.
+        """
+        messages = state.get("messages")
+        driver_history = state.get("driver_history")
+        error_history = state.get("error_history")
+
+        needs_trim = (
+            (messages and len(messages) > 20)
+            or (driver_history and len(driver_history) > 10)
+            or (error_history and len(error_history) > 5)
+        )
+        needs_clean = any(
+            temp_key in state and state[temp_key] is None
+            for temp_key in ("last_error", "failed_node", "next_node")
+        )
+
+        # Typical early-conversation states need neither trim nor cleanup;
+        # skip the full dict copy in that common case.
+        if not (needs_trim or needs_clean):
+            return state
+
+        compressed = state.copy()
+
+        if messages and len(messages) > 20:
+            compressed["messages"] = messages[:5] + messages[-15:]
+
+        if driver_history and len(driver_history) > 10:
+            compressed["driver_history"] = driver_history[-10:]
+
+        if error_history and len(error_history) > 5:
+            compressed["error_history"] = error_history[-5:]
+
+        for temp_key in ("last_error", "failed_node", "next_node"):
+            if temp_key in compressed and compressed[temp_key] is None:
+                del compressed[temp_key]
+
+        return compressed
+
+    async def save_state(self, session_id: str, state: Dict[str, Any]):
+        """
+        Persists a session's state, stamping versioning metadata.
+
+        Args:
+            session_id: The session identifier.
+            state: The state dict to persist.
+        """
+        compressed = self._compress_state(state)
+        key = self._get_state_key(session_id)
+
+        # Fingerprint the content with the save-time stamps excluded (the
+        # stamp changes every call). The extra msgpack encode is cheap next
+        # to zstd + the write, and turn-idempotent saves skip both entirely.
+        fingerprint = hash(self._enc.encode(
+            {k: v for k, v in compressed.items() if k not in _STAMP_KEYS}
+        ))
+        if self._last_saved.get(key) == fingerprint:
+            try:
+                await self._redis_expire(key, self.session_ttl)
+            except redis.RedisError as e:
+                logger.error(f"Error refreshing state TTL for session {session_id}: {e}")
+            return
+
+        # Stamp a copy: _compress_state returns the caller's own dict when
+        # nothing needed trimming, and the live session state must not be
+        # mutated here.
+        if compressed is state:
+            compressed = state.copy()
+
+        # time_ns is far cheaper than datetime.now().isoformat() and this
+        # stamp runs on every turn; the ISO form is derived lazily in
+        # get_session_info when something actually displays it.
+        compressed["last_updated_ns"] = time.time_ns()
+        compressed["state_version"] = STATE_VERSION
+
+        data = self._serialize_state(compressed)
+
+        if self._coalesce_writes:
+            if self._write_queue is None:
+                self._write_queue = asyncio.Queue()
+                self._flusher_task = asyncio.create_task(self._flush_loop())
+            # The fingerprint travels with the write and is only recorded
+            # once the flush succeeds — recording it here would make a later
+            # identical save skip a write that never reached Redis.
+            await self._write_queue.put((key, data, fingerprint, compressed))
+            return
+
+        try:
+            await self._redis_setex(key, self.session_ttl, data)
+            self._last_saved[key] = fingerprint
+        except redis.RedisError as e:
+            logger.error(f"Error saving state for session {session_id}: {e}")
+            self.memory_store[key] = compressed
+
+    async def _flush_loop(self):
+        """
+        Drains the write buffer: waits for the first pending write, sleeps
+        one coalescing window to gather neighbours, then issues the whole
+        batch (last write per key wins) as a single pipeline.
+        """
+        while True:
+            entry = await self._write_queue.get()
+            batch = {entry[0]: entry[1:]}
+            drained = 1
+            await asyncio.sleep(self._flush_interval)
+            while drained < self._flush_batch_size:
+                try:
+                    entry = self._write_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                batch[entry[0]] = entry[1:]
+                drained += 1
+
+            try:
+                pipe = self._redis_pipeline(transaction=False)
+                for key, (data, _, _) in batch.items():
+                    pipe.setex(key, self.session_ttl, data)
+                await pipe.execute()
+                for key, (_, fingerprint, _) in batch.items():
+                    self._last_saved[key] = fingerprint
+            except redis.RedisError as e:
+                logger.error(f"Error flushing {len(batch)} buffered state writes: {e}")
+                # Mirror the non-coalesced failure path: forget the
+                # fingerprints so the next save rewrites, and keep the states
+                # reachable from the in-memory fallback meanwhile.
+                for key, (_, _, compressed) in batch.items():
+                    self._last_saved.pop(key, None)
+                    self.memory_store[key] = compressed
+            finally:
+                for _ in range(drained):
+                    self._write_queue.task_done()
+
+    async def flush(self):
+        """
+        Waits until every buffered write has been handed to Redis. Call at
+        consistency points such as booking confirmation or shutdown.
+        """
+        if self._write_queue is not None:
+            await self._write_queue.join()
+
+    async def close(self):
+        """
+        Flushes any buffered writes and stops the background flusher, so
+        writes sitting inside the last coalescing window aren't lost on a
+        clean exit. Call at application shutdown.
+        """
+        await self.flush()
+        if self._flusher_task is not None:
+            self._flusher_task.cancel()
+            try:
+                await self._flusher_task
+            except asyncio.CancelledError:
+                pass
+            self._flusher_task = None
+            self._write_queue = None
+
+    async def get_state(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a session's state, refreshing its TTL on access.
+
+        Args:
+            session_id: The session identifier.
+
+        Returns:
+            The state dict if the session exists, otherwise None.
+        """
+        key = self._get_state_key(session_id)
+        try:
+            # Pipeline the read with the TTL refresh so both commands share a
+            # single round-trip; transaction=False avoids MULTI/EXEC overhead.
+            pipe = self._redis_pipeline(transaction=False)
+            pipe.get(key)
+            pipe.expire(key, self.session_ttl)
+            data, _ = await pipe.execute()
+            if data is None:
+                return None
+            return self._deserialize_state(data)
+        except redis.RedisError as e:
+            logger.error(f"Error getting state for session {session_id}: {e}")
+            return self.memory_store.get(key)
+
+    async def get_states(self, session_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Retrieves several sessions' states in a single round-trip (one MGET
+        plus pipelined TTL refreshes), for dashboards and multi-tenant flows
+        that would otherwise loop over get_state.
+
+        Args:
+            session_ids: The session identifiers to fetch.
+
+        Returns:
+            States in the same order as session_ids, with None for misses.
+        """
+        keys = [self._get_state_key(s) for s in session_ids]
+        try:
+            pipe = self._redis_pipeline(transaction=False)
+            pipe.mget(keys)
+            for key in keys:
+                pipe.expire(key, self.session_ttl)
+            results = await pipe.execute()
+            return [
+                self._deserialize_state(raw) if raw is not None else None
+                for raw in results[0]
+            ]
+        except redis.RedisError as e:
+            logger.error(f"Error batch-getting {len(session_ids)} states: {e}")
+            return [self.memory_store.get(key) for key in keys]
+
+    async def save_states(self, states: Dict[str, Dict[str, Any]]):
+        """
+        Persists several sessions' states in a single pipelined round-trip.
+
+        Args:
+            states: Mapping of session id to state dict.
+        """
+        entries = []
+        for session_id, state in states.items():
+            compressed = self._compress_state(state)
+            # Stamp a copy, never the caller's live dict.
+            if compressed is state:
+                compressed = state.copy()
+            compressed["last_updated_ns"] = time.time_ns()
+            compressed["state_version"] = STATE_VERSION
+            entries.append((self._get_state_key(session_id), compressed))
+
+        try:
+            pipe = self._redis_pipeline(transaction=False)
+            for key, compressed in entries:
+                pipe.setex(key, self.session_ttl, self._serialize_state(compressed))
+            await pipe.execute()
+        except redis.RedisError as e:
+            logger.error(f"Error batch-saving {len(entries)} states: {e}")
+            for key, compressed in entries:
+                self.memory_store[key] = compressed
+
+    async def delete_state(self, session_id: str):
+        """
+        Deletes a session's state.
+
+        Args:
+            session_id: The session identifier.
+        """
+        key = self._get_state_key(session_id)
+        try:
+            await self.redis_client.delete(key)
+        except redis.RedisError as e:
+            logger.error(f"Error deleting state for session {session_id}: {e}")
+        self.memory_store.pop(key, None)
+        self._last_saved.pop(key, None)
+
+    async def extend_session(self, session_id: str) -> bool:
+        """
+        Extends a session's TTL without reading its state.
+
+        Args:
+            session_id: The session identifier.
+
+        Returns:
+            True if the session existed and was extended, False otherwise.
+        """
+        key = self._get_state_key(session_id)
+        try:
+            # EXPIRE already reports whether the key existed, so a single
+            # round-trip replaces the EXISTS+EXPIRE pair.
+            return bool(await self._redis_expire(key, self.session_ttl))
+        except redis.RedisError as e:
+            logger.error(f"Error extending session {session_id}: {e}")
+            state = self.memory_store.get(key)
+            if state is None:
+                return False
+            # Re-inserting refreshes the entry's TTL.
+            self.memory_store[key] = state
+            return True
+
+    async def list_active_sessions(self) -> List[str]:
+        """
+        Lists the session ids that currently have persisted state.
+
+        Returns:
+            A list of session id strings.
+        """
+        try:
+            # SCAN chunks the keyspace walk (bounded per-iteration server work)
+            # instead of KEYS, which blocks Redis for the whole scan.
+            return [
+                k[self._key_prefix_len:].decode()
+                async for k in self.redis_client.scan_iter(match=self._key_prefix + b"*", count=500)
+            ]
+        except redis.RedisError as e:
+            logger.error(f"Error listing active sessions: {e}")
+            return [k[self._key_prefix_len:].decode() for k in self.memory_store]
+
+    async def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns lightweight summary info about a session for dashboards,
+        without handing back the full state payload.
+        """
+        state = await self.get_state(session_id)
+        if state is None:
+            return None
+
+        last_updated = state.get("last_updated")
+        if last_updated is None:
+            last_updated_ns = state.get("last_updated_ns")
+            if last_updated_ns is not None:
+                last_updated = datetime.fromtimestamp(last_updated_ns / 1e9).isoformat()
+
+        messages = state.get("messages")
+
+        return {
+            "session_id": session_id,
+            "message_count": len(messages) if messages else 0,
+            "search_city": state.get("search_city"),
+            "booking_active": state.get("booking_status") == "confirmed",
+            "last_updated": last_updated,
+            "state_version": state.get("state_version"),
+        }
+
+    def cleanup_expired_sessions(self):
+        """
+        Evicts expired entries from the in-memory fallback store. TTLCache
+        already evicts lazily on access; this just forces a sweep. Redis
+        entries expire on their own via SETEX.
+        """
+        self.memory_store.expire()
+
+    async def ping(self) -> bool:
+        """
+        Pings the Redis server to check if it's alive.
+
+        Returns:
+            True if the server is alive, False otherwise.
+        """
+        try:
+            return await self.redis_client.ping()
+        except redis.RedisError:
+            return False
+
+
+__all__ = ["StateManager"]